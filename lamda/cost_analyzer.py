@@ -1,11 +1,40 @@
 import boto3
+import functools
 import json
+import logging
+import threading
+import time
+from botocore.config import Config
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from decimal import Decimal
+from types import MappingProxyType
+from typing import NamedTuple
+
+# Per-resource details are logged at DEBUG; only per-check summaries are
+# printed so large scans don't flood CloudWatch Logs
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+# Shared client config: a connection pool large enough for parallel
+# discovery, and adaptive retries that back off when EC2 throttles
+BOTO_CONFIG = Config(
+    max_pool_connections=50,
+    retries={'mode': 'adaptive', 'max_attempts': 10},
+    tcp_keepalive=True,
+    connect_timeout=5,
+    read_timeout=30
+)
 
 # Initialize AWS clients
-ec2 = boto3.client('ec2')
-sns = boto3.client('sns')
+ec2 = boto3.client('ec2', config=BOTO_CONFIG)
+sns = boto3.client('sns', config=BOTO_CONFIG)
+REGION = ec2.meta.region_name
+# Pricing API is only served from a few regions; us-east-1 covers all of them
+# Fewer retries than EC2: a failed lookup just falls back to the hardcoded table
+pricing = boto3.client(
+    'pricing', region_name='us-east-1',
+    config=BOTO_CONFIG.merge(Config(retries={'mode': 'adaptive', 'max_attempts': 3}))
+)
 
 # Configuration
 SNS_TOPIC_ARN = 'arn:aws:sns:ap-south-1:574337396853:cost-alerts-topic'  # UPDATE THIS
@@ -13,14 +42,167 @@ TAG_KEY = 'CostOptimization'
 TAG_VALUE_PREFIX = 'DeleteAfter-'
 GRACE_PERIOD_DAYS = 7
 SNAPSHOT_AGE_THRESHOLD_DAYS = 90
+DESCRIBE_VOLUMES_BATCH_SIZE = 200  # Max volume IDs per describe_volumes call
+CREATE_TAGS_BATCH_SIZE = 1000  # Max resource IDs per create_tags call
+PRICE_FAILURE_TTL_SECONDS = 300  # Skip the Pricing API for a volume type this long after a failed lookup
+
+# (volume_type, region) -> failed_at; serialized by _price_lock so parallel
+# checks look each type up at most once per run
+_price_failures = {}
+_price_lock = threading.Lock()
+
+FINDING_CATEGORIES = (
+    'unattached_volumes',
+    'stopped_instances_with_volumes',
+    'old_snapshots',
+    'idle_elastic_ips'
+)
+
+# Fallback EBS pricing per GB/month for ap-south-1 (Mumbai),
+# used when the Pricing API lookup fails
+PRICE_PER_GB = MappingProxyType({
+    'gp2': 0.114,
+    'gp3': 0.091,
+    'io1': 0.143,
+    'io2': 0.143,
+    'sc1': 0.029,
+    'st1': 0.051,
+    'standard': 0.057
+})
+DEFAULT_PRICE_PER_GB = 0.10
+
+# Findings are NamedTuples rather than dicts to keep per-row memory low on
+# large accounts; use ._asdict() where a dict is needed for serialization
+class VolumeFinding(NamedTuple):
+    volume_id: str
+    size_gb: int
+    volume_type: str
+    monthly_cost: float
+    create_time: str
+    availability_zone: str
+    tags: dict
+    resource_type: str = 'ebs_volume'
+    
+    @property
+    def resource_id(self):
+        return self.volume_id
+
+class StoppedInstanceFinding(NamedTuple):
+    instance_id: str
+    instance_name: str
+    instance_type: str
+    monthly_cost: float
+    volumes: list
+    state_transition: str
+    tags: dict
+    resource_type: str = 'stopped_instance'
+    
+    @property
+    def resource_id(self):
+        return self.instance_id
+
+class SnapshotFinding(NamedTuple):
+    snapshot_id: str
+    size_gb: int
+    monthly_cost: float
+    age_days: int
+    start_time: str
+    description: str
+    tags: dict
+    resource_type: str = 'snapshot'
+    
+    @property
+    def resource_id(self):
+        return self.snapshot_id
+
+class ElasticIpFinding(NamedTuple):
+    allocation_id: str
+    public_ip: str
+    monthly_cost: float
+    tags: dict
+    resource_type: str = 'elastic_ip'
+    
+    @property
+    def resource_id(self):
+        return self.allocation_id
+
+def _tags_to_dict(aws_tags):
+    """
+    Convert an AWS [{'Key': ..., 'Value': ...}] tag list to a dict
+    """
+    return {tag['Key']: tag['Value'] for tag in aws_tags}
+
+def _describe_volumes(volume_ids):
+    """
+    Return {VolumeId: volume} for the given IDs, fetched in batches
+    instead of one describe_volumes call per volume
+    """
+    volumes_by_id = {}
+    
+    for i in range(0, len(volume_ids), DESCRIBE_VOLUMES_BATCH_SIZE):
+        batch = volume_ids[i:i + DESCRIBE_VOLUMES_BATCH_SIZE]
+        vol_response = ec2.describe_volumes(VolumeIds=batch)
+        for vol in vol_response['Volumes']:
+            volumes_by_id[vol['VolumeId']] = vol
+    
+    return volumes_by_id
+
+@functools.lru_cache(maxsize=None)
+def _fetch_ebs_price(volume_type, region):
+    """
+    Look up the EBS price per GB/month from the AWS Pricing API
+    Raises on failure, so only successful lookups are cached for the
+    lifetime of the Lambda execution environment
+    """
+    response = pricing.get_products(
+        ServiceCode='AmazonEC2',
+        Filters=[
+            {'Type': 'TERM_MATCH', 'Field': 'productFamily', 'Value': 'Storage'},
+            {'Type': 'TERM_MATCH', 'Field': 'volumeApiName', 'Value': volume_type},
+            {'Type': 'TERM_MATCH', 'Field': 'regionCode', 'Value': region}
+        ],
+        MaxResults=1
+    )
+    
+    for price_item in response['PriceList']:
+        product = json.loads(price_item)
+        for term in product['terms']['OnDemand'].values():
+            for dimension in term['priceDimensions'].values():
+                return float(dimension['pricePerUnit']['USD'])
+    
+    raise LookupError(f"no Pricing API result for {volume_type} in {region}")
+
+def get_ebs_price(volume_type, region):
+    """
+    Return the EBS price per GB/month, falling back to the hardcoded
+    ap-south-1 table when the lookup fails
+    A failure is remembered for PRICE_FAILURE_TTL_SECONDS, so each type is
+    tried (and warned about) once per run and retried on a later one
+    """
+    key = (volume_type, region)
+    with _price_lock:
+        failed_at = _price_failures.get(key)
+        if failed_at is None or time.monotonic() - failed_at > PRICE_FAILURE_TTL_SECONDS:
+            try:
+                return _fetch_ebs_price(volume_type, region)
+            except Exception as e:
+                _price_failures[key] = time.monotonic()
+                print(f"WARNING fetching EBS price for {volume_type} in {region} failed, using fallback: {str(e)}")
+    
+    return PRICE_PER_GB.get(volume_type, DEFAULT_PRICE_PER_GB)
 
 def lambda_handler(event, context):
     """
     Main Lambda function to analyze AWS costs and identify waste
     """
+    # Single timestamp for the whole run so every tag gets the same dates
+    run_ts = datetime.now(timezone.utc)
+    found_date = run_ts.strftime('%Y-%m-%d')
+    delete_after_date = (run_ts + timedelta(days=GRACE_PERIOD_DAYS)).strftime('%Y-%m-%d')
+    
     print("=" * 60)
     print("STARTING COST ANALYSIS SCAN")
-    print(f"Timestamp: {datetime.now(timezone.utc).isoformat()}")
+    print(f"Timestamp: {run_ts.isoformat()}")
     print("=" * 60)
     
     findings = {
@@ -31,27 +213,27 @@ def lambda_handler(event, context):
         'total_waste_monthly': 0.0
     }
     
-    # Run all cost checks
-    findings['unattached_volumes'] = find_unattached_volumes()
-    findings['stopped_instances_with_volumes'] = find_stopped_instances_with_volumes()
-    findings['old_snapshots'] = find_old_snapshots()
-    findings['idle_elastic_ips'] = find_idle_elastic_ips()
+    # Run all cost checks in parallel (independent, I/O-bound API calls)
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = {
+            'unattached_volumes': executor.submit(find_unattached_volumes),
+            'stopped_instances_with_volumes': executor.submit(find_stopped_instances_with_volumes),
+            'old_snapshots': executor.submit(find_old_snapshots),
+            'idle_elastic_ips': executor.submit(find_idle_elastic_ips)
+        }
+        for key, future in futures.items():
+            findings[key] = future.result()
     
     # Calculate total waste
-    for volume in findings['unattached_volumes']:
-        findings['total_waste_monthly'] += volume['monthly_cost']
-    
-    for instance in findings['stopped_instances_with_volumes']:
-        findings['total_waste_monthly'] += instance['monthly_cost']
-    
-    for snapshot in findings['old_snapshots']:
-        findings['total_waste_monthly'] += snapshot['monthly_cost']
-    
-    for eip in findings['idle_elastic_ips']:
-        findings['total_waste_monthly'] += eip['monthly_cost']
+    findings['total_waste_monthly'] = sum(
+        (resource.monthly_cost
+         for category in FINDING_CATEGORIES
+         for resource in findings[category]),
+        0.0
+    )
     
     # Tag resources for deletion
-    tag_resources_for_deletion(findings)
+    tag_resources_for_deletion(findings, found_date, delete_after_date)
     
     # Send report
     send_cost_report(findings)
@@ -65,12 +247,7 @@ def lambda_handler(event, context):
         'body': json.dumps({
             'message': 'Cost analysis complete',
             'total_waste': findings['total_waste_monthly'],
-            'findings_count': sum([
-                len(findings['unattached_volumes']),
-                len(findings['stopped_instances_with_volumes']),
-                len(findings['old_snapshots']),
-                len(findings['idle_elastic_ips'])
-            ])
+            'findings_count': sum(len(findings[category]) for category in FINDING_CATEGORIES)
         }, default=str)
     }
 
@@ -81,39 +258,32 @@ def find_unattached_volumes():
     unattached = []
     
     try:
-        response = ec2.describe_volumes()
+        # 'available' status == not attached to any instance
+        paginator = ec2.get_paginator('describe_volumes')
+        pages = paginator.paginate(
+            Filters=[
+                {'Name': 'status', 'Values': ['available']}
+            ],
+            PaginationConfig={'PageSize': 500}
+        )
         
-        for volume in response['Volumes']:
-            if len(volume['Attachments']) == 0:
-                volume_type = volume['VolumeType']
-                size_gb = volume['Size']
-                
-                # Pricing for ap-south-1 (Mumbai)
-                price_per_gb = {
-                    'gp2': 0.114,
-                    'gp3': 0.091,
-                    'io1': 0.143,
-                    'io2': 0.143,
-                    'sc1': 0.029,
-                    'st1': 0.051,
-                    'standard': 0.057
-                }
-                
-                monthly_cost = size_gb * price_per_gb.get(volume_type, 0.10)
-                
-                unattached.append({
-                    'resource_type': 'ebs_volume',
-                    'resource_id': volume['VolumeId'],
-                    'volume_id': volume['VolumeId'],
-                    'size_gb': size_gb,
-                    'volume_type': volume_type,
-                    'monthly_cost': round(monthly_cost, 2),
-                    'create_time': volume['CreateTime'].isoformat(),
-                    'availability_zone': volume['AvailabilityZone'],
-                    'tags': volume.get('Tags', [])
-                })
-                
-                print(f"✓ Unattached volume: {volume['VolumeId']} ({size_gb}GB {volume_type}) - ${monthly_cost:.2f}/month")
+        for volume in (v for page in pages for v in page['Volumes']):
+            volume_type = volume['VolumeType']
+            size_gb = volume['Size']
+            
+            monthly_cost = size_gb * get_ebs_price(volume_type, REGION)
+            
+            unattached.append(VolumeFinding(
+                volume_id=volume['VolumeId'],
+                size_gb=size_gb,
+                volume_type=volume_type,
+                monthly_cost=round(monthly_cost, 2),
+                create_time=volume['CreateTime'].isoformat(),
+                availability_zone=volume['AvailabilityZone'],
+                tags=_tags_to_dict(volume.get('Tags', []))
+            ))
+            
+            logger.debug("✓ Unattached volume: %s (%sGB %s) - $%.2f/month", volume['VolumeId'], size_gb, volume_type, monthly_cost)
         
         print(f"\nTotal unattached volumes: {len(unattached)}")
         return unattached
@@ -130,73 +300,81 @@ def find_stopped_instances_with_volumes():
     stopped_with_volumes = []
     
     try:
-        response = ec2.describe_instances(
+        paginator = ec2.get_paginator('describe_instances')
+        pages = paginator.paginate(
             Filters=[
                 {'Name': 'instance-state-name', 'Values': ['stopped']}
-            ]
+            ],
+            PaginationConfig={'PageSize': 500}
         )
         
-        for reservation in response['Reservations']:
-            for instance in reservation['Instances']:
-                # Calculate EBS cost for this stopped instance
-                total_ebs_cost = 0
-                volume_details = []
-                
-                for bdm in instance.get('BlockDeviceMappings', []):
-                    if 'Ebs' in bdm:
-                        volume_id = bdm['Ebs']['VolumeId']
+        instances = [
+            instance
+            for page in pages
+            for reservation in page['Reservations']
+            for instance in reservation['Instances']
+        ]
+        
+        # Fast path: nothing stopped, so skip volume lookups entirely
+        if not instances:
+            print("\nTotal stopped instances with volumes: 0")
+            return stopped_with_volumes
+        
+        # Collect every attached volume ID, then describe them in batches
+        # instead of one describe_volumes call per volume
+        all_volume_ids = [
+            bdm['Ebs']['VolumeId']
+            for instance in instances
+            for bdm in instance.get('BlockDeviceMappings', [])
+            if 'Ebs' in bdm
+        ]
+        
+        volumes_by_id = _describe_volumes(all_volume_ids)
+        
+        for instance in instances:
+            # Calculate EBS cost for this stopped instance
+            total_ebs_cost = 0
+            volume_details = []
+            
+            for bdm in instance.get('BlockDeviceMappings', []):
+                if 'Ebs' in bdm:
+                    volume_id = bdm['Ebs']['VolumeId']
+                    
+                    # Get volume details
+                    vol = volumes_by_id.get(volume_id)
+                    if vol:
+                        size_gb = vol['Size']
+                        volume_type = vol['VolumeType']
+                        
+                        volume_cost = size_gb * get_ebs_price(volume_type, REGION)
+                        total_ebs_cost += volume_cost
                         
-                        # Get volume details
-                        vol_response = ec2.describe_volumes(VolumeIds=[volume_id])
-                        if vol_response['Volumes']:
-                            vol = vol_response['Volumes'][0]
-                            size_gb = vol['Size']
-                            volume_type = vol['VolumeType']
-                            
-                            price_per_gb = {
-                                'gp2': 0.114,
-                                'gp3': 0.091,
-                                'io1': 0.143,
-                                'io2': 0.143,
-                                'sc1': 0.029,
-                                'st1': 0.051,
-                                'standard': 0.057
-                            }
-                            
-                            volume_cost = size_gb * price_per_gb.get(volume_type, 0.10)
-                            total_ebs_cost += volume_cost
-                            
-                            volume_details.append({
-                                'volume_id': volume_id,
-                                'size_gb': size_gb,
-                                'type': volume_type
-                            })
+                        volume_details.append({
+                            'volume_id': volume_id,
+                            'size_gb': size_gb,
+                            'type': volume_type
+                        })
+            
+            if total_ebs_cost > 0:
+                # Get instance name from tags
+                instance_tags = _tags_to_dict(instance.get('Tags', []))
+                instance_name = instance_tags.get('Name', 'unnamed')
                 
-                if total_ebs_cost > 0:
-                    # Get instance name from tags
-                    instance_name = 'unnamed'
-                    for tag in instance.get('Tags', []):
-                        if tag['Key'] == 'Name':
-                            instance_name = tag['Value']
-                            break
-                    
-                    # Calculate stopped duration
-                    state_transition_time = instance.get('StateTransitionReason', '')
-                    
-                    stopped_with_volumes.append({
-                        'resource_type': 'stopped_instance',
-                        'resource_id': instance['InstanceId'],
-                        'instance_id': instance['InstanceId'],
-                        'instance_name': instance_name,
-                        'instance_type': instance['InstanceType'],
-                        'monthly_cost': round(total_ebs_cost, 2),
-                        'volumes': volume_details,
-                        'state_transition': state_transition_time,
-                        'tags': instance.get('Tags', [])
-                    })
-                    
-                    print(f"✓ Stopped instance: {instance['InstanceId']} ({instance_name}) with {len(volume_details)} volumes - ${total_ebs_cost:.2f}/month in EBS costs")
-        
+                # Calculate stopped duration
+                state_transition_time = instance.get('StateTransitionReason', '')
+                
+                stopped_with_volumes.append(StoppedInstanceFinding(
+                    instance_id=instance['InstanceId'],
+                    instance_name=instance_name,
+                    instance_type=instance['InstanceType'],
+                    monthly_cost=round(total_ebs_cost, 2),
+                    volumes=volume_details,
+                    state_transition=state_transition_time,
+                    tags=instance_tags
+                ))
+                
+                logger.debug("✓ Stopped instance: %s (%s) with %d volumes - $%.2f/month in EBS costs", instance['InstanceId'], instance_name, len(volume_details), total_ebs_cost)
+    
         print(f"\nTotal stopped instances with volumes: {len(stopped_with_volumes)}")
         return stopped_with_volumes
         
@@ -213,11 +391,14 @@ def find_old_snapshots():
     
     try:
         # Get snapshots owned by this account
-        response = ec2.describe_snapshots(OwnerIds=['self'])
+        paginator = ec2.get_paginator('describe_snapshots')
+        pages = paginator.paginate(OwnerIds=['self'], PaginationConfig={'PageSize': 1000})
         
-        threshold_date = datetime.now(timezone.utc) - timedelta(days=SNAPSHOT_AGE_THRESHOLD_DAYS)
+        now = datetime.now(timezone.utc)
+        threshold_date = now - timedelta(days=SNAPSHOT_AGE_THRESHOLD_DAYS)
         
-        for snapshot in response['Snapshots']:
+        # Stream one page at a time rather than holding every snapshot in memory
+        for snapshot in (s for page in pages for s in page['Snapshots']):
             snapshot_date = snapshot['StartTime']
             
             if snapshot_date < threshold_date:
@@ -225,21 +406,19 @@ def find_old_snapshots():
                 size_gb = snapshot['VolumeSize']
                 monthly_cost = size_gb * 0.057
                 
-                age_days = (datetime.now(timezone.utc) - snapshot_date).days
+                age_days = (now - snapshot_date).days
                 
-                old_snapshots.append({
-                    'resource_type': 'snapshot',
-                    'resource_id': snapshot['SnapshotId'],
-                    'snapshot_id': snapshot['SnapshotId'],
-                    'size_gb': size_gb,
-                    'monthly_cost': round(monthly_cost, 2),
-                    'age_days': age_days,
-                    'start_time': snapshot_date.isoformat(),
-                    'description': snapshot.get('Description', 'No description'),
-                    'tags': snapshot.get('Tags', [])
-                })
+                old_snapshots.append(SnapshotFinding(
+                    snapshot_id=snapshot['SnapshotId'],
+                    size_gb=size_gb,
+                    monthly_cost=round(monthly_cost, 2),
+                    age_days=age_days,
+                    start_time=snapshot_date.isoformat(),
+                    description=snapshot.get('Description', 'No description'),
+                    tags=_tags_to_dict(snapshot.get('Tags', []))
+                ))
                 
-                print(f"✓ Old snapshot: {snapshot['SnapshotId']} ({age_days} days old, {size_gb}GB) - ${monthly_cost:.2f}/month")
+                logger.debug("✓ Old snapshot: %s (%d days old, %sGB) - $%.2f/month", snapshot['SnapshotId'], age_days, size_gb, monthly_cost)
         
         print(f"\nTotal old snapshots (>{SNAPSHOT_AGE_THRESHOLD_DAYS} days): {len(old_snapshots)}")
         return old_snapshots
@@ -264,16 +443,14 @@ def find_idle_elastic_ips():
                 # Idle EIP cost: $0.005/hour in ap-south-1
                 monthly_cost = 0.005 * 24 * 30  # ~$3.60/month
                 
-                idle_eips.append({
-                    'resource_type': 'elastic_ip',
-                    'resource_id': address['AllocationId'],
-                    'allocation_id': address['AllocationId'],
-                    'public_ip': address['PublicIp'],
-                    'monthly_cost': round(monthly_cost, 2),
-                    'tags': address.get('Tags', [])
-                })
+                idle_eips.append(ElasticIpFinding(
+                    allocation_id=address['AllocationId'],
+                    public_ip=address['PublicIp'],
+                    monthly_cost=round(monthly_cost, 2),
+                    tags=_tags_to_dict(address.get('Tags', []))
+                ))
                 
-                print(f"✓ Idle Elastic IP: {address['PublicIp']} ({address['AllocationId']}) - ${monthly_cost:.2f}/month")
+                logger.debug("✓ Idle Elastic IP: %s (%s) - $%.2f/month", address['PublicIp'], address['AllocationId'], monthly_cost)
         
         print(f"\nTotal idle Elastic IPs: {len(idle_eips)}")
         return idle_eips
@@ -282,50 +459,44 @@ def find_idle_elastic_ips():
         print(f"ERROR finding idle Elastic IPs: {str(e)}")
         return []
 
-def tag_resources_for_deletion(findings):
+def tag_resources_for_deletion(findings, found_date, delete_after_date):
     """
     Tag all identified resources for deletion after grace period
+    Dates are 'YYYY-MM-DD' strings computed once per run by lambda_handler
     """
-    delete_after_date = datetime.now() + timedelta(days=GRACE_PERIOD_DAYS)
-    tag_value = f"{TAG_VALUE_PREFIX}{delete_after_date.strftime('%Y-%m-%d')}"
+    tag_value = f"{TAG_VALUE_PREFIX}{delete_after_date}"
     
     resources_to_tag = []
     
     # Collect all resource IDs
     for volume in findings['unattached_volumes']:
-        resources_to_tag.append(volume['volume_id'])
+        resources_to_tag.append(volume.volume_id)
     
     for snapshot in findings['old_snapshots']:
-        resources_to_tag.append(snapshot['snapshot_id'])
+        resources_to_tag.append(snapshot.snapshot_id)
+    
+    # Elastic IP allocation IDs are taggable through the same create_tags call
+    for eip in findings['idle_elastic_ips']:
+        resources_to_tag.append(eip.allocation_id)
     
     # Tag in batches (EC2 API limit: 1000 resources per call)
-    if resources_to_tag:
+    tags = [
+        {'Key': TAG_KEY, 'Value': tag_value},
+        {'Key': 'AutomatedBy', 'Value': 'CostAnalyzer'},
+        {'Key': 'FoundDate', 'Value': found_date}
+    ]
+    
+    tagged_count = 0
+    for i in range(0, len(resources_to_tag), CREATE_TAGS_BATCH_SIZE):
+        batch = resources_to_tag[i:i + CREATE_TAGS_BATCH_SIZE]
         try:
-            ec2.create_tags(
-                Resources=resources_to_tag,
-                Tags=[
-                    {'Key': TAG_KEY, 'Value': tag_value},
-                    {'Key': 'AutomatedBy', 'Value': 'CostAnalyzer'},
-                    {'Key': 'FoundDate', 'Value': datetime.now().strftime('%Y-%m-%d')}
-                ]
-            )
-            print(f"\n✓ Tagged {len(resources_to_tag)} resources for deletion on {delete_after_date.strftime('%Y-%m-%d')}")
+            ec2.create_tags(Resources=batch, Tags=tags)
+            tagged_count += len(batch)
         except Exception as e:
             print(f"ERROR tagging resources: {str(e)}")
     
-    # Tag Elastic IPs separately (different API)
-    for eip in findings['idle_elastic_ips']:
-        try:
-            ec2.create_tags(
-                Resources=[eip['allocation_id']],
-                Tags=[
-                    {'Key': TAG_KEY, 'Value': tag_value},
-                    {'Key': 'AutomatedBy', 'Value': 'CostAnalyzer'},
-                    {'Key': 'FoundDate', 'Value': datetime.now().strftime('%Y-%m-%d')}
-                ]
-            )
-        except Exception as e:
-            print(f"ERROR tagging EIP {eip['allocation_id']}: {str(e)}")
+    if tagged_count:
+        print(f"\n✓ Tagged {tagged_count} resources for deletion on {delete_after_date}")
 
 def send_cost_report(findings):
     """
@@ -338,13 +509,14 @@ def send_cost_report(findings):
     
     total_issues = unattached_count + stopped_count + snapshot_count + eip_count
     total_waste = findings['total_waste_monthly']
+    annual_waste = total_waste * 12
     
     # Log full details to CloudWatch
     print("\n" + "=" * 60)
     print("COST ANALYSIS REPORT")
     print("=" * 60)
     print(f"Total Monthly Waste: ${total_waste:.2f}")
-    print(f"Annual Waste: ${total_waste * 12:.2f}")
+    print(f"Annual Waste: ${annual_waste:.2f}")
     print(f"\nBreakdown:")
     print(f"  Unattached EBS Volumes: {unattached_count}")
     print(f"  Stopped Instances (EBS cost): {stopped_count}")
@@ -356,19 +528,22 @@ def send_cost_report(findings):
     if total_issues == 0:
         message = "AWS Cost Alert: No waste found. All resources optimized."
     else:
-        message = f"AWS Cost Alert: {total_issues} issues found. "
-        message += f"Savings: ${total_waste:.2f}/mo (${total_waste * 12:.2f}/yr). "
+        parts = [
+            f"AWS Cost Alert: {total_issues} issues found. ",
+            f"Savings: ${total_waste:.2f}/mo (${annual_waste:.2f}/yr). "
+        ]
         
         if unattached_count > 0:
-            message += f"{unattached_count} unattached volumes. "
+            parts.append(f"{unattached_count} unattached volumes. ")
         if stopped_count > 0:
-            message += f"{stopped_count} stopped instances. "
+            parts.append(f"{stopped_count} stopped instances. ")
         if snapshot_count > 0:
-            message += f"{snapshot_count} old snapshots. "
+            parts.append(f"{snapshot_count} old snapshots. ")
         if eip_count > 0:
-            message += f"{eip_count} idle IPs. "
+            parts.append(f"{eip_count} idle IPs. ")
         
-        message += "Tagged for 7-day review."
+        parts.append("Tagged for 7-day review.")
+        message = ''.join(parts)
     
     try:
         response = sns.publish(
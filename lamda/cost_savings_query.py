@@ -1,61 +1,43 @@
 import boto3
+import functools
 import json
+from datetime import datetime
 from decimal import Decimal
-from datetime import datetime, timedelta
 
-dynamodb = boto3.resource('dynamodb')
-table = dynamodb.Table('CostOptimizationLog')
+TABLE_NAME = 'CostOptimizationLog'
+
+# Running totals row maintained by the cleanup Lambda (see resource_cleanup.py)
+AGGREGATE_KEY = {'deletion_id': {'S': 'AGG#totals'}, 'deleted_date': {'S': 'AGG'}}
+RESOURCE_TYPES = ('ebs_volume', 'snapshot', 'elastic_ip')
+
+@functools.lru_cache(maxsize=1)
+def _dynamodb():
+    """
+    Create the DynamoDB client on first use and reuse it on warm invocations
+    Low-level client: returns raw attribute values without Resource-layer
+    deserialization, which is all the aggregation needs
+    """
+    return boto3.client('dynamodb')
 
 def lambda_handler(event, context):
     """
     Query DynamoDB for cumulative cost savings
     """
     try:
-        # Scan all items (small table, this is fine)
-        response = table.scan()
-        items = response['Items']
+        # Fast path: single GetItem on the aggregate row
+        # Pass {"recompute": true} to rebuild totals from the full table
+        recompute = bool((event or {}).get('recompute'))
+        aggregate = None
+        if not recompute:
+            aggregate = _dynamodb().get_item(TableName=TABLE_NAME, Key=AGGREGATE_KEY).get('Item')
         
-        # Calculate totals
-        total_monthly_savings = 0
-        resource_counts = {
-            'ebs_volume': 0,
-            'snapshot': 0,
-            'elastic_ip': 0
-        }
+        if not aggregate:
+            # Missing row (first query since deploy) or explicit rebuild:
+            # aggregate the full table and persist it for the fast path
+            aggregate = aggregate_items(scan_all_items())
+            save_aggregate(aggregate, overwrite=recompute)
         
-        for item in items:
-            savings = float(item.get('monthly_savings', 0))
-            total_monthly_savings += savings
-            
-            resource_type = item.get('resource_type', 'unknown')
-            if resource_type in resource_counts:
-                resource_counts[resource_type] += 1
-        
-        # Calculate date range
-        if items:
-            dates = [item['deleted_date'] for item in items]
-            first_deletion = min(dates)
-            last_deletion = max(dates)
-            
-            # Calculate days of operation
-            first_date = datetime.strptime(first_deletion, '%Y-%m-%d')
-            last_date = datetime.strptime(last_deletion, '%Y-%m-%d')
-            days_operating = (last_date - first_date).days + 1
-        else:
-            first_deletion = 'N/A'
-            last_deletion = 'N/A'
-            days_operating = 0
-        
-        result = {
-            'total_resources_deleted': len(items),
-            'total_monthly_savings': round(total_monthly_savings, 2),
-            'total_annual_savings': round(total_monthly_savings * 12, 2),
-            'resource_breakdown': resource_counts,
-            'first_deletion_date': first_deletion,
-            'last_deletion_date': last_deletion,
-            'days_operating': days_operating,
-            'average_savings_per_day': round(total_monthly_savings / 30, 2) if total_monthly_savings > 0 else 0
-        }
+        result = summarize_aggregate(aggregate)
         
         print(json.dumps(result, indent=2))
         
@@ -69,4 +51,134 @@ def lambda_handler(event, context):
         return {
             'statusCode': 500,
             'body': json.dumps({'error': str(e)})
-        }
\ No newline at end of file
+        }
+
+def _attr(item, name, default=None):
+    """
+    Unwrap a low-level DynamoDB attribute value such as {'S': ...} or {'N': ...}
+    """
+    value = item.get(name)
+    if value is None:
+        return default
+    return next(iter(value.values()))
+
+def scan_all_items():
+    """
+    Scan every deletion record across all pages, reading only the
+    attributes needed for the savings report
+    """
+    items = []
+    paginator = _dynamodb().get_paginator('scan')
+    pages = paginator.paginate(
+        TableName=TABLE_NAME,
+        ProjectionExpression='deletion_id, monthly_savings, resource_type, deleted_date'
+    )
+    
+    for page in pages:
+        items.extend(
+            item for item in page['Items']
+            if item['deletion_id'] != AGGREGATE_KEY['deletion_id']
+        )
+    
+    return items
+
+def summarize_aggregate(aggregate):
+    """
+    Build the savings report from the pre-computed aggregate row
+    """
+    total_monthly_savings = float(_attr(aggregate, 'total_monthly_savings', 0))
+    resource_counts = {
+        resource_type: int(_attr(aggregate, f'{resource_type}_count', 0))
+        for resource_type in RESOURCE_TYPES
+    }
+    
+    return build_result(
+        total_resources_deleted=int(_attr(aggregate, 'total_resources_deleted', 0)),
+        total_monthly_savings=total_monthly_savings,
+        resource_counts=resource_counts,
+        first_deletion=_attr(aggregate, 'first_deletion_date'),
+        last_deletion=_attr(aggregate, 'last_deletion_date')
+    )
+
+def aggregate_items(items):
+    """
+    Aggregate individual deletion records into an aggregate row, in the
+    same low-level format the cleanup Lambda's ADD updates maintain
+    """
+    # Calculate totals and date range in a single pass
+    total_monthly_savings = Decimal(0)
+    resource_counts = {resource_type: 0 for resource_type in RESOURCE_TYPES}
+    first_deletion = None
+    last_deletion = None
+    
+    for item in items:
+        total_monthly_savings += Decimal(_attr(item, 'monthly_savings', '0'))
+        
+        resource_type = _attr(item, 'resource_type', 'unknown')
+        if resource_type in resource_counts:
+            resource_counts[resource_type] += 1
+        
+        # ISO 'YYYY-MM-DD' strings sort chronologically, so compare them
+        # directly and only parse the two extremes in build_result
+        deleted_date = _attr(item, 'deleted_date')
+        if first_deletion is None or deleted_date < first_deletion:
+            first_deletion = deleted_date
+        if last_deletion is None or deleted_date > last_deletion:
+            last_deletion = deleted_date
+    
+    aggregate = dict(AGGREGATE_KEY)
+    aggregate['total_monthly_savings'] = {'N': str(total_monthly_savings)}
+    aggregate['total_resources_deleted'] = {'N': str(len(items))}
+    for resource_type, count in resource_counts.items():
+        aggregate[f'{resource_type}_count'] = {'N': str(count)}
+    if first_deletion:
+        aggregate['first_deletion_date'] = {'S': first_deletion}
+        aggregate['last_deletion_date'] = {'S': last_deletion}
+    
+    return aggregate
+
+def save_aggregate(aggregate, overwrite=False):
+    """
+    Persist a scanned aggregate row; unless overwriting, only create it if
+    no other invocation has seeded it in the meantime
+    """
+    client = _dynamodb()
+    try:
+        if overwrite:
+            client.put_item(TableName=TABLE_NAME, Item=aggregate)
+        else:
+            client.put_item(
+                TableName=TABLE_NAME,
+                Item=aggregate,
+                ConditionExpression='attribute_not_exists(deletion_id)'
+            )
+    except client.exceptions.ConditionalCheckFailedException:
+        pass
+    except Exception as e:
+        # The report is still correct; the next query retries seeding
+        print(f"ERROR: Saving aggregate row failed: {str(e)}")
+
+def build_result(total_resources_deleted, total_monthly_savings, resource_counts, first_deletion, last_deletion):
+    """
+    Shape the cumulative savings response
+    """
+    if first_deletion and last_deletion:
+        # Calculate days of operation
+        first_date = datetime.strptime(first_deletion, '%Y-%m-%d')
+        last_date = datetime.strptime(last_deletion, '%Y-%m-%d')
+        days_operating = (last_date - first_date).days + 1
+    else:
+        first_deletion = 'N/A'
+        last_deletion = 'N/A'
+        days_operating = 0
+    
+    return {
+        'total_resources_deleted': total_resources_deleted,
+        'total_monthly_savings': round(total_monthly_savings, 2),
+        'total_annual_savings': round(total_monthly_savings * 12, 2),
+        'resource_breakdown': resource_counts,
+        'first_deletion_date': first_deletion,
+        'last_deletion_date': last_deletion,
+        'days_operating': days_operating,
+        'average_savings_per_day': round(total_monthly_savings / 30, 2) if total_monthly_savings > 0 else 0
+    }
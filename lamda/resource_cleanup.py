@@ -1,390 +1,802 @@
 import boto3
+import functools
 import json
-from datetime import datetime, timezone
-from typing import List, Dict
+import logging
+import re
+import time
+from collections import Counter
+from botocore.config import Config
+from botocore.exceptions import WaiterError
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from types import MappingProxyType
+from typing import List, Dict, Optional, Set, Tuple
+
+# Configured once per cold start; Lambda ships these records to CloudWatch
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+# Shared client config: connection pool sized for 3 parallel scans x
+# DELETE_WORKERS fan-out, and adaptive retries that back off when throttled
+BOTO_CONFIG = Config(
+    max_pool_connections=32,
+    retries={'mode': 'adaptive', 'max_attempts': 10},
+    connect_timeout=3,
+    read_timeout=10
+)
 
 # Initialize AWS clients
-dynamodb = boto3.resource('dynamodb')
-table = dynamodb.Table('CostOptimizationLog')
-ec2 = boto3.client('ec2')
-sns = boto3.client('sns')
+# Low-level DynamoDB client: items are written as pre-serialized
+# AttributeValues, skipping the Resource layer's per-attribute marshalling
+dynamodb = boto3.client('dynamodb', config=BOTO_CONFIG)
+ec2 = boto3.client('ec2', config=BOTO_CONFIG)
+sns = boto3.client('sns', config=BOTO_CONFIG)
 
 # Configuration
 SNS_TOPIC_ARN = 'arn:aws:sns:ap-south-1:574337396853:cost-alerts-topic'  # UPDATE THIS
+TABLE_NAME = 'CostOptimizationLog'
 TAG_KEY = 'CostOptimization'
 TAG_VALUE_PREFIX = 'DeleteAfter-'
 DRY_RUN = False  # Set to True to test without actually deleting
+DELETE_WORKERS = 8  # Concurrent delete/release calls per resource type
+EXPIRED_TAG_LOOKBACK_YEARS = 5  # Oldest DeleteAfter year matched by the expired-tag filter
+DESCRIBE_CACHE_TTL_SECONDS = 60
+
+# Matches the whole value "DeleteAfter-2025-02-09" (use fullmatch), capturing the date
+_TAG_RE = re.compile(rf'{re.escape(TAG_VALUE_PREFIX)}([0-9]{{4}}-[0-9]{{2}}-[0-9]{{2}})')
+
+# "api:params" -> (fetched_at, resources); survives across warm invocations
+_describe_cache: Dict[str, Tuple[float, List[Dict]]] = {}
+
+class _PriceTable(dict):
+    """
+    Price lookup that falls back to DEFAULT_PRICE_PER_GB for unknown
+    volume types without inserting them
+    """
+    def __missing__(self, volume_type):
+        return DEFAULT_PRICE_PER_GB
+
+# EBS pricing per GB/month for ap-south-1 (Mumbai)
+# Money is kept as Decimal end to end so amounts written to DynamoDB are exact
+DEFAULT_PRICE_PER_GB = Decimal('0.10')
+PRICE_PER_GB = MappingProxyType(_PriceTable({
+    'gp2': Decimal('0.114'), 'gp3': Decimal('0.091'), 'io1': Decimal('0.143'),
+    'io2': Decimal('0.143'), 'sc1': Decimal('0.029'), 'st1': Decimal('0.051'),
+    'standard': Decimal('0.057')
+}))
+SNAPSHOT_PRICE_PER_GB = Decimal('0.057')  # Snapshot pricing in ap-south-1
+EIP_MONTHLY_COST = Decimal('0.005') * 24 * 30  # ~$3.60/month
+AGGREGATE_KEY = {'deletion_id': {'S': 'AGG#totals'}, 'deleted_date': {'S': 'AGG'}}  # Running totals read by cost_savings_query
+DYNAMODB_BATCH_SIZE = 25  # Max items per BatchWriteItem call
+BATCH_WRITE_MAX_ATTEMPTS = 5
+SNAPSHOT_WAIT_DELAY_SECONDS = 5  # Poll interval of the snapshot_completed waiter
+SNAPSHOT_WAIT_MAX_SECONDS = 600  # Never wait longer than this, even with time to spare
+REPORT_RESERVE_SECONDS = 30  # Invocation time kept back for deletes, DynamoDB logging and the report
+SAFETY_SNAPSHOT_REUSE_DAYS = 7  # Reuse a safety snapshot started by an earlier run within this window
+SNAPSHOT_FILTER_BATCH_SIZE = 200  # Max values per EC2 describe filter
 
 def lambda_handler(event, context):
     """
     Main Lambda function to clean up expired resources
     """
-    print("=" * 60)
-    print("STARTING RESOURCE CLEANUP SCAN")
-    print(f"Timestamp: {datetime.now(timezone.utc).isoformat()}")
-    print(f"DRY RUN MODE: {DRY_RUN}")
-    print("=" * 60)
+    logger.info("STARTING RESOURCE CLEANUP SCAN at %s (DRY RUN MODE: %s)",
+                datetime.now(timezone.utc).isoformat(), DRY_RUN)
     
-    cleanup_results = {
-        'volumes_deleted': [],
-        'snapshots_deleted': [],
-        'eips_released': [],
-        'volumes_skipped': [],
-        'snapshots_skipped': [],
-        'total_savings_monthly': 0.0
-    }
+    cleanup_results = new_cleanup_results()
+    
+    # Bound the safety snapshot wait so logging and the report always run
+    # before the invocation times out
+    snapshot_wait_seconds = SNAPSHOT_WAIT_MAX_SECONDS
+    if context is not None:
+        remaining_seconds = context.get_remaining_time_in_millis() / 1000
+        snapshot_wait_seconds = min(snapshot_wait_seconds, remaining_seconds - REPORT_RESERVE_SECONDS)
+    
+    # Find and clean up expired resources in parallel (independent EC2 APIs)
+    # Each scan fills its own pre-allocated results dict in place, which is
+    # merged once it completes
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        futures = {
+            executor.submit(cleanup_fn, partial): partial
+            for cleanup_fn, partial in (
+                (functools.partial(cleanup_expired_volumes, snapshot_wait_seconds=snapshot_wait_seconds),
+                 new_cleanup_results()),
+                (cleanup_expired_snapshots, new_cleanup_results()),
+                (cleanup_expired_eips, new_cleanup_results())
+            )
+        }
+        for future in as_completed(futures):
+            future.result()
+            merge_cleanup_results(cleanup_results, futures[future])
     
-    # Find and clean up expired resources
-    cleanup_results = cleanup_expired_volumes(cleanup_results)
-    cleanup_results = cleanup_expired_snapshots(cleanup_results)
-    cleanup_results = cleanup_expired_eips(cleanup_results)
+    # Count once; shared by the DynamoDB log, the report and the response
+    counts = count_cleanup_results(cleanup_results)
     
-    log_deletions_to_dynamodb(cleanup_results)
+    log_deletions_to_dynamodb(cleanup_results, counts)
     
     # Send report
-    send_cleanup_report(cleanup_results)
+    send_cleanup_report(cleanup_results, counts)
     
-    print("=" * 60)
-    print("CLEANUP COMPLETE")
-    print("=" * 60)
+    logger.info("CLEANUP COMPLETE")
     
     return {
         'statusCode': 200,
         'body': json.dumps({
             'message': 'Cleanup complete',
-            'deleted_count': len(cleanup_results['volumes_deleted']) + 
-                           len(cleanup_results['snapshots_deleted']) + 
-                           len(cleanup_results['eips_released']),
-            'savings': cleanup_results['total_savings_monthly']
+            'deleted_count': counts['total'],
+            'savings': float(cleanup_results['total_savings_monthly'])
         }, default=str)
     }
 
-def cleanup_expired_volumes(results: Dict) -> Dict:
+def new_cleanup_results() -> Dict:
+    """
+    Create an empty cleanup results dict
+    """
+    return {
+        'volumes_deleted': [],
+        'snapshots_deleted': [],
+        'eips_released': [],
+        'volumes_skipped': [],
+        'snapshots_skipped': [],
+        'total_savings_monthly': Decimal('0')
+    }
+
+def merge_cleanup_results(results: Dict, partial: Dict):
+    """
+    Merge one cleanup scan's results into the combined results
+    """
+    for key, value in partial.items():
+        if isinstance(value, list):
+            results[key].extend(value)
+        else:
+            results[key] += value
+
+def count_cleanup_results(results: Dict) -> Dict[str, int]:
+    """
+    Count deleted/skipped resources per type, plus the total deleted
+    """
+    counts = {
+        'volumes': len(results['volumes_deleted']),
+        'snapshots': len(results['snapshots_deleted']),
+        'eips': len(results['eips_released']),
+        'volumes_skipped': len(results['volumes_skipped'])
+    }
+    counts['total'] = counts['volumes'] + counts['snapshots'] + counts['eips']
+    return counts
+
+def expired_tag_values(today: date) -> List[str]:
+    """
+    Build DeleteAfter tag filter values matching every date up to today,
+    so EC2 only returns resources whose grace period has already expired
+    Uses exact days for the current month and wildcards for earlier
+    months/years to stay well under the per-filter value limit
+    """
+    values = [
+        f"{TAG_VALUE_PREFIX}{today.replace(day=day).isoformat()}"
+        for day in range(1, today.day + 1)
+    ]
+    values += [
+        f"{TAG_VALUE_PREFIX}{today.year}-{month:02d}-*"
+        for month in range(1, today.month)
+    ]
+    values += [
+        f"{TAG_VALUE_PREFIX}{year}-*"
+        for year in range(today.year - EXPIRED_TAG_LOOKBACK_YEARS, today.year)
+    ]
+    return values
+
+def extract_delete_after(aws_tags: List[Dict]) -> Optional[date]:
+    """
+    Return the DeleteAfter date from a resource's tags, or None if the
+    tag is missing or malformed
+    """
+    tags = {tag['Key']: tag['Value'] for tag in aws_tags}
+    tag_value = tags.get(TAG_KEY)
+    if tag_value is None:
+        return None
+    
+    # Validate the format and extract the date in one match
+    match = _TAG_RE.fullmatch(tag_value)
+    if not match:
+        logger.warning("[WARN] Invalid date format in %s tag: %s", TAG_KEY, tag_value)
+        return None
+    
+    return parse_tag_date(match.group(1))
+
+@functools.lru_cache(maxsize=512)
+def parse_tag_date(date_str: str) -> Optional[date]:
+    """
+    Parse a 'YYYY-MM-DD' tag date; cached since many resources share a date
+    The shape is already validated by _TAG_RE, so only impossible dates
+    (e.g. 2025-02-31) can raise
+    """
+    try:
+        return date(int(date_str[0:4]), int(date_str[5:7]), int(date_str[8:10]))
+    except ValueError:
+        logger.warning("[WARN] Invalid date in %s tag: %s", TAG_KEY, date_str)
+        return None
+
+def describe_cached(api: str, result_key: str, **kwargs) -> List[Dict]:
     """
-    Find and delete EBS volumes with expired grace period
+    Run an EC2 describe_* call (all pages), reusing the result for
+    DESCRIBE_CACHE_TTL_SECONDS across warm invocations
     """
-    print("\n--- SCANNING VOLUMES ---")
+    cache_key = f"{api}:{json.dumps(kwargs, sort_keys=True, default=str)}"
+    now = time.monotonic()
+    
+    cached = _describe_cache.get(cache_key)
+    if cached and now - cached[0] <= DESCRIBE_CACHE_TTL_SECONDS:
+        return cached[1]
+    
+    if ec2.can_paginate(api):
+        pages = ec2.get_paginator(api).paginate(**kwargs)
+        resources = [resource for page in pages for resource in page[result_key]]
+    else:
+        resources = getattr(ec2, api)(**kwargs)[result_key]
+    
+    _describe_cache[cache_key] = (now, resources)
+    return resources
+
+def invalidate_describe_cache():
+    """
+    Drop cached describe results after any mutating EC2 call
+    """
+    _describe_cache.clear()
+
+def cleanup_expired_volumes(results: Dict, snapshot_wait_seconds: float = SNAPSHOT_WAIT_MAX_SECONDS) -> None:
+    """
+    Find and delete EBS volumes with expired grace period, recording
+    outcomes into results in place
+    Waits at most snapshot_wait_seconds for safety snapshots to complete
+    """
+    logger.info("--- SCANNING VOLUMES ---")
+    
+    # Bound once; called per resource in the loops below
+    append_deleted = results['volumes_deleted'].append
+    append_skipped = results['volumes_skipped'].append
     
     try:
-        # Get volumes tagged for deletion
-        response = ec2.describe_volumes(
+        today = datetime.now(timezone.utc).date()
+        
+        # Get volumes whose grace period has expired
+        volumes = describe_cached(
+            'describe_volumes', 'Volumes',
             Filters=[
-                {'Name': f'tag:{TAG_KEY}', 'Values': [f'{TAG_VALUE_PREFIX}*']}
-            ]
+                {'Name': f'tag:{TAG_KEY}', 'Values': expired_tag_values(today)}
+            ],
+            PaginationConfig={'PageSize': 500}
         )
         
-        today = datetime.now(timezone.utc).date()
+        # Pass 1: keep volumes whose grace period has expired (the tag
+        # filter only returns dates up to today; this drops malformed ones)
+        expired = [
+            volume for volume in volumes
+            if (delete_after_date := extract_delete_after(volume.get('Tags', []))) and today >= delete_after_date
+        ]
         
-        for volume in response['Volumes']:
-            volume_id = volume['VolumeId']
-            size_gb = volume['Size']
-            volume_type = volume['VolumeType']
-            
-            # Get deletion date from tags
-            delete_after_date = None
-            for tag in volume.get('Tags', []):
-                if tag['Key'] == TAG_KEY:
-                    # Extract date from "DeleteAfter-2025-02-09"
-                    date_str = tag['Value'].replace(TAG_VALUE_PREFIX, '')
-                    try:
-                        delete_after_date = datetime.strptime(date_str, '%Y-%m-%d').date()
-                    except ValueError:
-                        print(f"⚠️  Invalid date format for {volume_id}: {tag['Value']}")
-                        continue
-            
-            if not delete_after_date:
-                continue
-            
-            # Check if grace period has expired
-            if today >= delete_after_date:
-                # Calculate savings
-                price_per_gb = {
-                    'gp2': 0.114, 'gp3': 0.091, 'io1': 0.143,
-                    'io2': 0.143, 'sc1': 0.029, 'st1': 0.051,
-                    'standard': 0.057
-                }
-                monthly_cost = size_gb * price_per_gb.get(volume_type, 0.10)
-                
-                # Check if still unattached
-                if len(volume['Attachments']) > 0:
-                    print(f"⏭️  SKIPPED {volume_id}: Now attached to instance")
-                    results['volumes_skipped'].append({
-                        'volume_id': volume_id,
-                        'reason': 'attached_to_instance'
-                    })
-                    continue
-                
-                # Create snapshot before deletion (safety)
-                snapshot_id = None
-                if not DRY_RUN:
-                    try:
-                        snapshot_response = ec2.create_snapshot(
-                            VolumeId=volume_id,
-                            Description=f"Pre-deletion snapshot of {volume_id} by automated cleanup",
-                            TagSpecifications=[
-                                {
-                                    'ResourceType': 'snapshot',
-                                    'Tags': [
-                                        {'Key': 'Name', 'Value': f'AutoCleanup-{volume_id}'},
-                                        {'Key': 'OriginalVolumeId', 'Value': volume_id},
-                                        {'Key': 'AutomatedBy', 'Value': 'ResourceCleanup'},
-                                        {'Key': 'CreatedDate', 'Value': today.isoformat()}
-                                    ]
-                                }
-                            ]
-                        )
-                        snapshot_id = snapshot_response['SnapshotId']
-                        print(f"📸 Created safety snapshot: {snapshot_id}")
-                    except Exception as e:
-                        print(f"❌ ERROR creating snapshot for {volume_id}: {str(e)}")
-                        results['volumes_skipped'].append({
-                            'volume_id': volume_id,
-                            'reason': f'snapshot_failed: {str(e)}'
-                        })
-                        continue
-                
-                # Delete the volume
-                if DRY_RUN:
-                    print(f"🧪 DRY RUN: Would delete {volume_id} ({size_gb}GB {volume_type}) - ${monthly_cost:.2f}/month")
-                else:
-                    try:
-                        ec2.delete_volume(VolumeId=volume_id)
-                        print(f"✅ DELETED {volume_id} ({size_gb}GB {volume_type}) - ${monthly_cost:.2f}/month saved")
-                        
-                        results['volumes_deleted'].append({
-                            'volume_id': volume_id,
-                            'size_gb': size_gb,
-                            'volume_type': volume_type,
-                            'monthly_savings': monthly_cost,
-                            'snapshot_id': snapshot_id,
-                            'deleted_date': today.isoformat()
-                        })
-                        results['total_savings_monthly'] += monthly_cost
-                        
-                    except Exception as e:
-                        print(f"❌ ERROR deleting {volume_id}: {str(e)}")
-                        results['volumes_skipped'].append({
-                            'volume_id': volume_id,
-                            'reason': f'deletion_failed: {str(e)}'
-                        })
+        # Pass 2: re-check that expired volumes are still unattached
+        for volume in expired:
+            if volume['Attachments']:
+                logger.info("[SKIP] %s: Now attached to instance", volume['VolumeId'])
+                append_skipped({
+                    'volume_id': volume['VolumeId'],
+                    'reason': 'attached_to_instance'
+                })
+        
+        expired_volumes = [
+            {
+                'volume_id': volume['VolumeId'],
+                'size_gb': volume['Size'],
+                'volume_type': volume['VolumeType'],
+                'monthly_cost': Decimal(volume['Size']) * PRICE_PER_GB[volume['VolumeType']]
+            }
+            for volume in expired if not volume['Attachments']
+        ]
+        
+        if DRY_RUN:
+            for volume in expired_volumes:
+                logger.info("[DRY RUN] Would delete %s (%sGB %s) - $%.2f/month", volume['volume_id'],
+                            volume['size_gb'], volume['volume_type'], volume['monthly_cost'])
+            return
+        
+        # Pass 3: reuse safety snapshots started by earlier runs, and start
+        # the missing ones concurrently without waiting on each
+        existing = find_safety_snapshots([volume['volume_id'] for volume in expired_volumes], today)
+        snapshotted = []
+        to_snapshot = []
+        for volume in expired_volumes:
+            snapshot_id = existing.get(volume['volume_id'])
+            if snapshot_id:
+                logger.info("[SNAPSHOT] Reusing safety snapshot %s for %s", snapshot_id, volume['volume_id'])
+                snapshotted.append((volume, snapshot_id))
+            else:
+                to_snapshot.append(volume)
+        
+        with ThreadPoolExecutor(max_workers=DELETE_WORKERS) as executor:
+            started = list(executor.map(lambda volume: create_safety_snapshot(volume, today), to_snapshot))
+        
+        for volume, (snapshot_id, skipped) in zip(to_snapshot, started):
+            if snapshot_id:
+                snapshotted.append((volume, snapshot_id))
+            else:
+                append_skipped(skipped)
+        
+        # Only delete volumes whose safety snapshot has actually completed;
+        # pending ones are picked up (not re-snapshotted) by a later run
+        completed = wait_for_snapshots([snapshot_id for _, snapshot_id in snapshotted], snapshot_wait_seconds)
+        deletable = []
+        for volume, snapshot_id in snapshotted:
+            if snapshot_id in completed:
+                deletable.append((volume, snapshot_id))
             else:
-                days_remaining = (delete_after_date - today).days
-                print(f"⏰ Grace period active for {volume_id}: {days_remaining} days remaining")
+                logger.warning("[SKIP] %s: Safety snapshot %s not completed", volume['volume_id'], snapshot_id)
+                append_skipped({
+                    'volume_id': volume['volume_id'],
+                    'reason': f'snapshot_incomplete: {snapshot_id}'
+                })
         
-        print(f"\nVolumes deleted: {len(results['volumes_deleted'])}")
-        print(f"Volumes skipped: {len(results['volumes_skipped'])}")
+        # Delete snapshotted volumes concurrently
+        with ThreadPoolExecutor(max_workers=DELETE_WORKERS) as executor:
+            futures = [
+                executor.submit(delete_expired_volume, volume, snapshot_id, today)
+                for volume, snapshot_id in deletable
+            ]
+            for future in as_completed(futures):
+                deleted, record = future.result()
+                if deleted:
+                    append_deleted(record)
+                    results['total_savings_monthly'] += record['monthly_savings']
+                else:
+                    append_skipped(record)
+        
+        logger.info("Volumes deleted: %d, skipped: %d", len(results['volumes_deleted']), len(results['volumes_skipped']))
         
     except Exception as e:
-        print(f"ERROR in volume cleanup: {str(e)}")
-    
-    return results
+        logger.error("[ERR] Volume cleanup failed: %s", e)
 
-def cleanup_expired_snapshots(results: Dict) -> Dict:
+def find_safety_snapshots(volume_ids: List[str], today) -> Dict[str, str]:
     """
-    Find and delete snapshots with expired grace period
+    Find pending/completed safety snapshots that earlier runs started for
+    these volumes within SAFETY_SNAPSHOT_REUSE_DAYS
+    Returns {volume_id: snapshot_id}, preferring completed snapshots
     """
-    print("\n--- SCANNING SNAPSHOTS ---")
+    reuse_after = today - timedelta(days=SAFETY_SNAPSHOT_REUSE_DAYS)
+    found = {}
     
-    try:
-        response = ec2.describe_snapshots(
+    for i in range(0, len(volume_ids), SNAPSHOT_FILTER_BATCH_SIZE):
+        snapshots = describe_cached(
+            'describe_snapshots', 'Snapshots',
             OwnerIds=['self'],
             Filters=[
-                {'Name': f'tag:{TAG_KEY}', 'Values': [f'{TAG_VALUE_PREFIX}*']}
+                {'Name': 'tag:OriginalVolumeId', 'Values': volume_ids[i:i + SNAPSHOT_FILTER_BATCH_SIZE]},
+                {'Name': 'tag:AutomatedBy', 'Values': ['ResourceCleanup']},
+                {'Name': 'status', 'Values': ['pending', 'completed']}
+            ]
+        )
+        for snapshot in snapshots:
+            if snapshot['StartTime'].date() < reuse_after:
+                continue
+            volume_id = snapshot['VolumeId']
+            current = found.get(volume_id)
+            if current is None or (snapshot['State'] == 'completed' and current['State'] != 'completed'):
+                found[volume_id] = snapshot
+    
+    return {volume_id: snapshot['SnapshotId'] for volume_id, snapshot in found.items()}
+
+def create_safety_snapshot(volume: Dict, today) -> Tuple[Optional[str], Optional[Dict]]:
+    """
+    Start a safety snapshot of one expired volume without waiting for it
+    Returns (snapshot_id, None) or (None, skipped record)
+    """
+    volume_id = volume['volume_id']
+    
+    try:
+        snapshot_response = ec2.create_snapshot(
+            VolumeId=volume_id,
+            Description=f"Pre-deletion snapshot of {volume_id} by automated cleanup",
+            TagSpecifications=[
+                {
+                    'ResourceType': 'snapshot',
+                    'Tags': [
+                        {'Key': 'Name', 'Value': f'AutoCleanup-{volume_id}'},
+                        {'Key': 'OriginalVolumeId', 'Value': volume_id},
+                        {'Key': 'AutomatedBy', 'Value': 'ResourceCleanup'},
+                        {'Key': 'CreatedDate', 'Value': today.isoformat()}
+                    ]
+                }
             ]
         )
+        snapshot_id = snapshot_response['SnapshotId']
+        invalidate_describe_cache()
+        logger.info("[SNAPSHOT] Started safety snapshot: %s", snapshot_id)
+        return snapshot_id, None
+    except Exception as e:
+        logger.error("[ERR] Creating snapshot for %s failed: %s", volume_id, e)
+        return None, {
+            'volume_id': volume_id,
+            'reason': f'snapshot_failed: {str(e)}'
+        }
+
+def wait_for_snapshots(snapshot_ids: List[str], max_wait_seconds: float) -> Set[str]:
+    """
+    Wait up to max_wait_seconds for safety snapshots to complete with a
+    single waiter, so each poll is one DescribeSnapshots call for the batch
+    Returns the IDs of snapshots that completed
+    """
+    if not snapshot_ids:
+        return set()
+    
+    max_attempts = int(max_wait_seconds // SNAPSHOT_WAIT_DELAY_SECONDS)
+    if max_attempts > 0:
+        try:
+            ec2.get_waiter('snapshot_completed').wait(
+                SnapshotIds=snapshot_ids,
+                WaiterConfig={'Delay': SNAPSHOT_WAIT_DELAY_SECONDS, 'MaxAttempts': max_attempts}
+            )
+            return set(snapshot_ids)
+        except WaiterError as e:
+            # Out of time or a snapshot errored; keep whichever did complete
+            logger.warning("[WARN] Waiting for safety snapshots failed: %s", e)
+    
+    snapshots = ec2.describe_snapshots(SnapshotIds=snapshot_ids)['Snapshots']
+    return {snapshot['SnapshotId'] for snapshot in snapshots if snapshot['State'] == 'completed'}
+
+def delete_expired_volume(volume: Dict, snapshot_id: str, today) -> Tuple[bool, Dict]:
+    """
+    Delete one expired volume whose safety snapshot has completed
+    Returns (True, deleted record) or (False, skipped record)
+    """
+    volume_id = volume['volume_id']
+    size_gb = volume['size_gb']
+    volume_type = volume['volume_type']
+    monthly_cost = volume['monthly_cost']
+    
+    try:
+        ec2.delete_volume(VolumeId=volume_id)
+        invalidate_describe_cache()
+        logger.info("[OK] DELETED %s (%sGB %s) - $%.2f/month saved", volume_id, size_gb, volume_type, monthly_cost)
+        
+        return True, {
+            'volume_id': volume_id,
+            'size_gb': size_gb,
+            'volume_type': volume_type,
+            'monthly_savings': monthly_cost,
+            'snapshot_id': snapshot_id,
+            'deleted_date': today.isoformat()
+        }
         
+    except Exception as e:
+        logger.error("[ERR] Deleting %s failed: %s", volume_id, e)
+        return False, {
+            'volume_id': volume_id,
+            'reason': f'deletion_failed: {str(e)}'
+        }
+
+def cleanup_expired_snapshots(results: Dict) -> None:
+    """
+    Find and delete snapshots with expired grace period, recording
+    outcomes into results in place
+    """
+    logger.info("--- SCANNING SNAPSHOTS ---")
+    
+    # Bound once; called per resource in the loops below
+    append_deleted = results['snapshots_deleted'].append
+    append_skipped = results['snapshots_skipped'].append
+    
+    try:
         today = datetime.now(timezone.utc).date()
         
-        for snapshot in response['Snapshots']:
-            snapshot_id = snapshot['SnapshotId']
-            size_gb = snapshot['VolumeSize']
-            
-            # Get deletion date
-            delete_after_date = None
-            for tag in snapshot.get('Tags', []):
-                if tag['Key'] == TAG_KEY:
-                    date_str = tag['Value'].replace(TAG_VALUE_PREFIX, '')
-                    try:
-                        delete_after_date = datetime.strptime(date_str, '%Y-%m-%d').date()
-                    except ValueError:
-                        continue
-            
-            if not delete_after_date:
-                continue
-            
-            if today >= delete_after_date:
-                monthly_cost = size_gb * 0.057  # Snapshot pricing in ap-south-1
-                
-                if DRY_RUN:
-                    print(f"🧪 DRY RUN: Would delete snapshot {snapshot_id} ({size_gb}GB) - ${monthly_cost:.2f}/month")
+        snapshots = describe_cached(
+            'describe_snapshots', 'Snapshots',
+            OwnerIds=['self'],
+            Filters=[
+                {'Name': f'tag:{TAG_KEY}', 'Values': expired_tag_values(today)}
+            ],
+            PaginationConfig={'PageSize': 1000}
+        )
+        
+        # Pass 1: keep snapshots whose grace period has expired
+        expired_snapshots = [
+            {
+                'snapshot_id': snapshot['SnapshotId'],
+                'size_gb': snapshot['VolumeSize'],
+                'monthly_cost': Decimal(snapshot['VolumeSize']) * SNAPSHOT_PRICE_PER_GB
+            }
+            for snapshot in snapshots
+            if (delete_after_date := extract_delete_after(snapshot.get('Tags', []))) and today >= delete_after_date
+        ]
+        
+        if DRY_RUN:
+            for snapshot in expired_snapshots:
+                logger.info("[DRY RUN] Would delete snapshot %s (%sGB) - $%.2f/month",
+                            snapshot['snapshot_id'], snapshot['size_gb'], snapshot['monthly_cost'])
+            return
+        
+        # Pass 2: delete expired snapshots concurrently
+        with ThreadPoolExecutor(max_workers=DELETE_WORKERS) as executor:
+            futures = [
+                executor.submit(delete_expired_snapshot, snapshot, today)
+                for snapshot in expired_snapshots
+            ]
+            for future in as_completed(futures):
+                deleted, record = future.result()
+                if deleted:
+                    append_deleted(record)
+                    results['total_savings_monthly'] += record['monthly_savings']
                 else:
-                    try:
-                        ec2.delete_snapshot(SnapshotId=snapshot_id)
-                        print(f"✅ DELETED snapshot {snapshot_id} ({size_gb}GB) - ${monthly_cost:.2f}/month saved")
-                        
-                        results['snapshots_deleted'].append({
-                            'snapshot_id': snapshot_id,
-                            'size_gb': size_gb,
-                            'monthly_savings': monthly_cost,
-                            'deleted_date': today.isoformat()
-                        })
-                        results['total_savings_monthly'] += monthly_cost
-                        
-                    except Exception as e:
-                        print(f"❌ ERROR deleting snapshot {snapshot_id}: {str(e)}")
-                        results['snapshots_skipped'].append({
-                            'snapshot_id': snapshot_id,
-                            'reason': str(e)
-                        })
-        
-        print(f"\nSnapshots deleted: {len(results['snapshots_deleted'])}")
+                    append_skipped(record)
+        
+        logger.info("Snapshots deleted: %d", len(results['snapshots_deleted']))
         
     except Exception as e:
-        print(f"ERROR in snapshot cleanup: {str(e)}")
+        logger.error("[ERR] Snapshot cleanup failed: %s", e)
+
+def delete_expired_snapshot(snapshot: Dict, today) -> Tuple[bool, Dict]:
+    """
+    Delete one expired snapshot
+    Returns (True, deleted record) or (False, skipped record)
+    """
+    snapshot_id = snapshot['snapshot_id']
+    size_gb = snapshot['size_gb']
+    monthly_cost = snapshot['monthly_cost']
     
-    return results
+    try:
+        ec2.delete_snapshot(SnapshotId=snapshot_id)
+        invalidate_describe_cache()
+        logger.info("[OK] DELETED snapshot %s (%sGB) - $%.2f/month saved", snapshot_id, size_gb, monthly_cost)
+        
+        return True, {
+            'snapshot_id': snapshot_id,
+            'size_gb': size_gb,
+            'monthly_savings': monthly_cost,
+            'deleted_date': today.isoformat()
+        }
+        
+    except Exception as e:
+        logger.error("[ERR] Deleting snapshot %s failed: %s", snapshot_id, e)
+        return False, {
+            'snapshot_id': snapshot_id,
+            'reason': str(e)
+        }
 
-def cleanup_expired_eips(results: Dict) -> Dict:
+def cleanup_expired_eips(results: Dict) -> None:
     """
-    Find and release Elastic IPs with expired grace period
+    Find and release Elastic IPs with expired grace period, recording
+    outcomes into results in place
     """
-    print("\n--- SCANNING ELASTIC IPs ---")
+    logger.info("--- SCANNING ELASTIC IPs ---")
+    
+    # Bound once; called per resource in the loop below
+    append_released = results['eips_released'].append
     
     try:
-        response = ec2.describe_addresses(
+        today = datetime.now(timezone.utc).date()
+        
+        # describe_addresses is not paginated; it returns every match at once
+        addresses = describe_cached(
+            'describe_addresses', 'Addresses',
             Filters=[
-                {'Name': f'tag:{TAG_KEY}', 'Values': [f'{TAG_VALUE_PREFIX}*']}
+                {'Name': f'tag:{TAG_KEY}', 'Values': expired_tag_values(today)}
             ]
         )
         
-        today = datetime.now(timezone.utc).date()
+        # Pass 1: keep Elastic IPs whose grace period has expired
+        expired = [
+            address for address in addresses
+            if (delete_after_date := extract_delete_after(address.get('Tags', []))) and today >= delete_after_date
+        ]
         
-        for address in response['Addresses']:
-            allocation_id = address['AllocationId']
-            public_ip = address['PublicIp']
-            
-            # Get deletion date
-            delete_after_date = None
-            for tag in address.get('Tags', []):
-                if tag['Key'] == TAG_KEY:
-                    date_str = tag['Value'].replace(TAG_VALUE_PREFIX, '')
-                    try:
-                        delete_after_date = datetime.strptime(date_str, '%Y-%m-%d').date()
-                    except ValueError:
-                        continue
-            
-            if not delete_after_date:
-                continue
-            
-            if today >= delete_after_date:
-                # Check if now associated (someone attached it)
-                if 'AssociationId' in address:
-                    print(f"⏭️  SKIPPED {allocation_id} ({public_ip}): Now associated with instance")
-                    continue
-                
-                monthly_cost = 0.005 * 24 * 30  # ~$3.60/month
-                
-                if DRY_RUN:
-                    print(f"🧪 DRY RUN: Would release EIP {public_ip} ({allocation_id}) - ${monthly_cost:.2f}/month")
-                else:
-                    try:
-                        ec2.release_address(AllocationId=allocation_id)
-                        print(f"✅ RELEASED EIP {public_ip} ({allocation_id}) - ${monthly_cost:.2f}/month saved")
-                        
-                        results['eips_released'].append({
-                            'allocation_id': allocation_id,
-                            'public_ip': public_ip,
-                            'monthly_savings': monthly_cost,
-                            'released_date': today.isoformat()
-                        })
-                        results['total_savings_monthly'] += monthly_cost
-                        
-                    except Exception as e:
-                        print(f"❌ ERROR releasing EIP {allocation_id}: {str(e)}")
-        
-        print(f"\nElastic IPs released: {len(results['eips_released'])}")
+        # Pass 2: re-check that they are still unassociated (someone may have attached one)
+        for address in expired:
+            if 'AssociationId' in address:
+                logger.info("[SKIP] %s (%s): Now associated with instance", address['AllocationId'], address['PublicIp'])
+        
+        expired_eips = [
+            {
+                'allocation_id': address['AllocationId'],
+                'public_ip': address['PublicIp'],
+                'monthly_cost': EIP_MONTHLY_COST
+            }
+            for address in expired if 'AssociationId' not in address
+        ]
+        
+        if DRY_RUN:
+            for eip in expired_eips:
+                logger.info("[DRY RUN] Would release EIP %s (%s) - $%.2f/month",
+                            eip['public_ip'], eip['allocation_id'], eip['monthly_cost'])
+            return
+        
+        # Pass 3: release expired Elastic IPs concurrently
+        with ThreadPoolExecutor(max_workers=DELETE_WORKERS) as executor:
+            futures = [
+                executor.submit(release_expired_eip, eip, today)
+                for eip in expired_eips
+            ]
+            for future in as_completed(futures):
+                released, record = future.result()
+                if released:
+                    append_released(record)
+                    results['total_savings_monthly'] += record['monthly_savings']
+        
+        logger.info("Elastic IPs released: %d", len(results['eips_released']))
         
     except Exception as e:
-        print(f"ERROR in EIP cleanup: {str(e)}")
+        logger.error("[ERR] EIP cleanup failed: %s", e)
+
+def release_expired_eip(eip: Dict, today) -> Tuple[bool, Optional[Dict]]:
+    """
+    Release one expired Elastic IP
+    Returns (True, released record) or (False, None)
+    """
+    allocation_id = eip['allocation_id']
+    public_ip = eip['public_ip']
+    monthly_cost = eip['monthly_cost']
     
-    return results
+    try:
+        ec2.release_address(AllocationId=allocation_id)
+        invalidate_describe_cache()
+        logger.info("[OK] RELEASED EIP %s (%s) - $%.2f/month saved", public_ip, allocation_id, monthly_cost)
+        
+        return True, {
+            'allocation_id': allocation_id,
+            'public_ip': public_ip,
+            'monthly_savings': monthly_cost,
+            'released_date': today.isoformat()
+        }
+        
+    except Exception as e:
+        logger.error("[ERR] Releasing EIP %s failed: %s", allocation_id, e)
+        return False, None
 
-def log_deletions_to_dynamodb(results: Dict):
+def log_deletions_to_dynamodb(results: Dict, counts: Dict[str, int]):
     """
     Log all deletions to DynamoDB for historical tracking
     """
     try:
+        # Items are pre-serialized to low-level AttributeValues
+        # (the low-level API takes numbers as strings; str(Decimal) is exact)
+        put_requests = []
+        
         # Log each deleted volume
         for volume in results['volumes_deleted']:
-            table.put_item(
-                Item={
-                    'deletion_id': f"volume-{volume['volume_id']}-{volume['deleted_date']}",
-                    'deleted_date': volume['deleted_date'],
-                    'resource_type': 'ebs_volume',
-                    'resource_id': volume['volume_id'],
-                    'size_gb': volume['size_gb'],
-                    'volume_type': volume['volume_type'],
-                    'monthly_savings': str(volume['monthly_savings']),  # DynamoDB doesn't support float
-                    'snapshot_id': volume.get('snapshot_id', 'none')
-                }
-            )
+            put_requests.append({'PutRequest': {'Item': {
+                'deletion_id': {'S': f"volume-{volume['volume_id']}-{volume['deleted_date']}"},
+                'deleted_date': {'S': volume['deleted_date']},
+                'resource_type': {'S': 'ebs_volume'},
+                'resource_id': {'S': volume['volume_id']},
+                'size_gb': {'N': str(volume['size_gb'])},
+                'volume_type': {'S': volume['volume_type']},
+                'monthly_savings': {'N': str(volume['monthly_savings'])},
+                'snapshot_id': {'S': volume.get('snapshot_id') or 'none'}
+            }}})
         
         # Log each deleted snapshot
         for snapshot in results['snapshots_deleted']:
-            table.put_item(
-                Item={
-                    'deletion_id': f"snapshot-{snapshot['snapshot_id']}-{snapshot['deleted_date']}",
-                    'deleted_date': snapshot['deleted_date'],
-                    'resource_type': 'snapshot',
-                    'resource_id': snapshot['snapshot_id'],
-                    'size_gb': snapshot['size_gb'],
-                    'monthly_savings': str(snapshot['monthly_savings'])
-                }
-            )
+            put_requests.append({'PutRequest': {'Item': {
+                'deletion_id': {'S': f"snapshot-{snapshot['snapshot_id']}-{snapshot['deleted_date']}"},
+                'deleted_date': {'S': snapshot['deleted_date']},
+                'resource_type': {'S': 'snapshot'},
+                'resource_id': {'S': snapshot['snapshot_id']},
+                'size_gb': {'N': str(snapshot['size_gb'])},
+                'monthly_savings': {'N': str(snapshot['monthly_savings'])}
+            }}})
         
         # Log each released EIP
         for eip in results['eips_released']:
-            table.put_item(
-                Item={
-                    'deletion_id': f"eip-{eip['allocation_id']}-{eip['released_date']}",
-                    'deleted_date': eip['released_date'],
-                    'resource_type': 'elastic_ip',
-                    'resource_id': eip['allocation_id'],
-                    'public_ip': eip['public_ip'],
-                    'monthly_savings': str(eip['monthly_savings'])
-                }
-            )
+            put_requests.append({'PutRequest': {'Item': {
+                'deletion_id': {'S': f"eip-{eip['allocation_id']}-{eip['released_date']}"},
+                'deleted_date': {'S': eip['released_date']},
+                'resource_type': {'S': 'elastic_ip'},
+                'resource_id': {'S': eip['allocation_id']},
+                'public_ip': {'S': eip['public_ip']},
+                'monthly_savings': {'N': str(eip['monthly_savings'])}
+            }}})
+        
+        unprocessed = []
+        for i in range(0, len(put_requests), DYNAMODB_BATCH_SIZE):
+            unprocessed += batch_write_with_retry(put_requests[i:i + DYNAMODB_BATCH_SIZE])
         
-        print(f"\n✓ Logged {len(results['volumes_deleted']) + len(results['snapshots_deleted']) + len(results['eips_released'])} deletions to DynamoDB")
+        # Roll only the records actually written into the running totals,
+        # so the aggregate row always matches a full-table recompute
+        unwritten_ids = {request['PutRequest']['Item']['deletion_id']['S'] for request in unprocessed}
+        written_items = [
+            request['PutRequest']['Item'] for request in put_requests
+            if request['PutRequest']['Item']['deletion_id']['S'] not in unwritten_ids
+        ]
+        update_savings_aggregate(written_items)
+        
+        logger.info("[OK] Logged %d of %d deletions to DynamoDB", len(written_items), counts['total'])
         
     except Exception as e:
-        print(f"\nERROR logging to DynamoDB: {str(e)}")
+        logger.error("[ERR] Logging to DynamoDB failed: %s", e)
         # Don't fail the whole function if logging fails
 
+def batch_write_with_retry(write_requests: List[Dict]) -> List[Dict]:
+    """
+    Write up to 25 requests with BatchWriteItem, resending any
+    UnprocessedItems with exponential backoff
+    Returns the write requests that were not written, including those
+    pending when a call raised, so callers can leave them out of totals
+    """
+    request_items = {TABLE_NAME: write_requests}
+    
+    for attempt in range(BATCH_WRITE_MAX_ATTEMPTS):
+        try:
+            response = dynamodb.batch_write_item(RequestItems=request_items)
+        except Exception as e:
+            pending = request_items.get(TABLE_NAME, [])
+            logger.error("[ERR] DynamoDB batch write of %d items failed: %s", len(pending), e)
+            return pending
+        request_items = response.get('UnprocessedItems', {})
+        if not request_items:
+            return []
+        time.sleep(0.1 * (2 ** attempt))
+    
+    unprocessed = request_items.get(TABLE_NAME, [])
+    logger.error("[ERR] %d DynamoDB writes still unprocessed after %d attempts", len(unprocessed), BATCH_WRITE_MAX_ATTEMPTS)
+    return unprocessed
+
+def update_savings_aggregate(written_items: List[Dict]):
+    """
+    Atomically add this run's logged deletions to the aggregate totals row
+    The row must already exist: cost_savings_query seeds it from a full
+    scan, so creating it here would drop every earlier deletion
+    """
+    if not written_items:
+        return
+    
+    run_savings = sum(Decimal(item['monthly_savings']['N']) for item in written_items)
+    type_counts = Counter(item['resource_type']['S'] for item in written_items)
+    # Dates come from the records themselves so they match a recompute
+    deleted_dates = [item['deleted_date']['S'] for item in written_items]
+    
+    try:
+        dynamodb.update_item(
+            TableName=TABLE_NAME,
+            Key=AGGREGATE_KEY,
+            UpdateExpression=(
+                'ADD total_monthly_savings :savings, total_resources_deleted :total, '
+                'ebs_volume_count :volumes, snapshot_count :snapshots, elastic_ip_count :eips '
+                'SET first_deletion_date = if_not_exists(first_deletion_date, :first), '
+                'last_deletion_date = :last'
+            ),
+            ConditionExpression='attribute_exists(deletion_id)',
+            ExpressionAttributeValues={
+                ':savings': {'N': str(run_savings)},
+                ':total': {'N': str(len(written_items))},
+                ':volumes': {'N': str(type_counts['ebs_volume'])},
+                ':snapshots': {'N': str(type_counts['snapshot'])},
+                ':eips': {'N': str(type_counts['elastic_ip'])},
+                ':first': {'S': min(deleted_dates)},
+                ':last': {'S': max(deleted_dates)}
+            }
+        )
+    except dynamodb.exceptions.ConditionalCheckFailedException:
+        # This run's records are in the table, so the seeding scan will count them
+        logger.info("[SKIP] Aggregate row not seeded yet; cost_savings_query builds it from a full scan")
 
-def send_cleanup_report(results: Dict):
+def send_cleanup_report(results: Dict, counts: Dict[str, int]):
     """
     Send cleanup report via SNS
     """
-    total_deleted = (len(results['volumes_deleted']) + 
-                    len(results['snapshots_deleted']) + 
-                    len(results['eips_released']))
-    
+    total_deleted = counts['total']
     total_savings = results['total_savings_monthly']
     
     # Log full details
-    print("\n" + "=" * 60)
-    print("CLEANUP REPORT")
-    print("=" * 60)
-    print(f"Total Resources Deleted: {total_deleted}")
-    print(f"Monthly Savings: ${total_savings:.2f}")
-    print(f"Annual Savings: ${total_savings * 12:.2f}")
-    print(f"\nBreakdown:")
-    print(f"  Volumes deleted: {len(results['volumes_deleted'])}")
-    print(f"  Snapshots deleted: {len(results['snapshots_deleted'])}")
-    print(f"  Elastic IPs released: {len(results['eips_released'])}")
-    print(f"  Volumes skipped: {len(results['volumes_skipped'])}")
-    print("=" * 60)
+    logger.info(
+        "CLEANUP REPORT\n"
+        "Total Resources Deleted: %d\n"
+        "Monthly Savings: $%.2f\n"
+        "Annual Savings: $%.2f\n"
+        "Breakdown:\n"
+        "  Volumes deleted: %d\n"
+        "  Snapshots deleted: %d\n"
+        "  Elastic IPs released: %d\n"
+        "  Volumes skipped: %d",
+        total_deleted, total_savings, total_savings * 12,
+        counts['volumes'], counts['snapshots'],
+        counts['eips'], counts['volumes_skipped']
+    )
     
     # SMS message
     if total_deleted == 0:
@@ -393,21 +805,29 @@ def send_cleanup_report(results: Dict):
         message = f"AWS Cleanup: Deleted {total_deleted} expired resources. "
         message += f"Savings: ${total_savings:.2f}/mo (${total_savings * 12:.2f}/yr). "
         
-        if results['volumes_deleted']:
-            message += f"{len(results['volumes_deleted'])} volumes. "
-        if results['snapshots_deleted']:
-            message += f"{len(results['snapshots_deleted'])} snapshots. "
-        if results['eips_released']:
-            message += f"{len(results['eips_released'])} IPs. "
+        if counts['volumes']:
+            message += f"{counts['volumes']} volumes. "
+        if counts['snapshots']:
+            message += f"{counts['snapshots']} snapshots. "
+        if counts['eips']:
+            message += f"{counts['eips']} IPs. "
         
         message += "Safety snapshots created. Check CloudWatch for details."
     
+    # (subject, message) pairs; sent together in one PublishBatch call
+    notifications = [(f"Cleanup: ${total_savings:.2f}/mo saved", message)]
+    
     try:
-        response = sns.publish(
+        response = sns.publish_batch(
             TopicArn=SNS_TOPIC_ARN,
-            Subject=f"Cleanup: ${total_savings:.2f}/mo saved",
-            Message=message
+            PublishBatchRequestEntries=[
+                {'Id': str(i), 'Subject': subject, 'Message': body}
+                for i, (subject, body) in enumerate(notifications)
+            ]
         )
-        print(f"\n✓ SMS sent. MessageId: {response['MessageId']}")
+        for entry in response.get('Successful', []):
+            logger.info("[OK] SMS sent. MessageId: %s", entry['MessageId'])
+        for entry in response.get('Failed', []):
+            logger.error("[ERR] Sending SNS entry %s failed: %s", entry['Id'], entry.get('Message', entry['Code']))
     except Exception as e:
-        print(f"\nERROR sending SNS: {str(e)}")
\ No newline at end of file
+        logger.error("[ERR] Sending SNS failed: %s", e)
\ No newline at end of file